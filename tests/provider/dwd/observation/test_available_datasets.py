@@ -5,21 +5,16 @@ from wetterdienst import boot
 
 boot.monkeypatch()
 
-import polars as pl
 import pytest
 from fsspec.implementations.http import HTTPFileSystem
 
-from wetterdienst import Resolution
-from wetterdienst.provider.dwd.observation import DwdObservationResolution
 from wetterdienst.provider.dwd.observation.metadata.dataset import (
     RESOLUTION_DATASET_MAPPING,
-    DwdObservationDataset,
 )
 from wetterdienst.provider.dwd.observation.metadata.parameter import (
     DwdObservationParameter,
 )
 from wetterdienst.util.cache import CacheExpiry
-from wetterdienst.util.enumeration import parse_enumeration_from_template
 
 SKIP_DATASETS = (
     ("10_minutes", "wind_test"),
@@ -50,19 +45,13 @@ def test_compare_available_dwd_datasets(default_settings):
     )
     base_url = "https://opendata.dwd.de/climate_environment/CDC/observations_germany/climate/"
     files = fs.expand_path(base_url, recursive=True, maxdepth=3)
-    df = pl.DataFrame({"files": files})
-    df = df.with_columns(pl.col("files").apply(lambda s: s[len(base_url) : -1]))
-    # filter resolution folders
-    df = df.filter(pl.col("files").apply(lambda s: s.count("/")) == 1)
-    df = df.select(
-        pl.col("files").str.split("/").arr.first().alias("resolution"),
-        pl.col("files").str.split("/").arr.last().alias("dataset"),
-    )
-    for resolution, dataset in df.iter_rows():
-        rd_pair = (resolution, dataset)
-        if rd_pair in SKIP_DATASETS:
-            continue
-        resolution = parse_enumeration_from_template(resolution, DwdObservationResolution, Resolution)
-        dataset = DwdObservationDataset(dataset)
-        assert dataset in RESOLUTION_DATASET_MAPPING[resolution].keys()
-        assert DwdObservationParameter[resolution.name][dataset.name]
+    # keep only resolution/dataset folders
+    paths = (file[len(base_url) : -1] for file in files)
+    observed = {tuple(path.split("/")) for path in paths if path.count("/") == 1}
+    valid = {
+        (resolution.value, dataset.value)
+        for resolution, datasets in RESOLUTION_DATASET_MAPPING.items()
+        for dataset in datasets
+        if DwdObservationParameter[resolution.name][dataset.name]
+    }
+    assert not observed - set(SKIP_DATASETS) - valid
@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2018-2023, earthobservations developers.
+# Distributed under the MIT License. See LICENSE for more info.
+import pytest
+
+from wetterdienst.provider.dwd.road.api import DwdRoadRequest
+
+
+@pytest.fixture(autouse=True)
+def reset_metaindex_cache(monkeypatch):
+    """Don't share the class level metaindex cache and its locks between tests"""
+    monkeypatch.setattr(DwdRoadRequest, "_metaindex_cache", {})
+    monkeypatch.setattr(DwdRoadRequest, "_metaindex_locks", {})
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2018-2023, earthobservations developers.
+# Distributed under the MIT License. See LICENSE for more info.
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import polars as pl
+import pytest
+
+from wetterdienst import Settings
+from wetterdienst.provider.dwd.road.api import DwdRoadRequest
+from wetterdienst.util.cache import CacheExpiry
+
+
+@pytest.fixture
+def metaindex():
+    return pl.DataFrame(
+        {
+            "station_id": ["A006"],
+            "name": ["Boeglum"],
+            "state": ["SH"],
+            "road_name": ["L5S"],
+            "road_sector": ["2"],
+            "road_type": [1],
+            "road_surroundings_type": [2],
+            "road_surface_type": [1],
+            "latitude": [54.8892],
+            "longitude": [8.9087],
+            "height": [2.0],
+            "station_group": ["KK"],
+            "has_file": [None],
+        },
+        schema=DwdRoadRequest._dtypes,
+    )
+
+
+@pytest.fixture
+def create_metaindex(monkeypatch, metaindex):
+    """Replace download and parsing of the xlsx, record the cache dir of each call"""
+    calls = []
+
+    def _create_metaindex(self):
+        calls.append(self.settings.cache_dir)
+        return metaindex
+
+    monkeypatch.setattr(DwdRoadRequest, "_create_metaindex", _create_metaindex)
+    return calls
+
+
+def _metaindex_file(cache_dir):
+    return cache_dir / "dwd_road" / f"metaindex_v{DwdRoadRequest._metaindex_version}.parquet"
+
+
+def _request(cache_dir, cache_disable=False):
+    return DwdRoadRequest("minute_10", settings=Settings(cache_dir=cache_dir, cache_disable=cache_disable))
+
+
+def _backdate(file, seconds):
+    mtime = time.time() - seconds
+    os.utime(file, (mtime, mtime))
+    return mtime
+
+
+def test_metaindex_memory_cache(tmp_path, create_metaindex, metaindex):
+    df1 = _request(tmp_path)._all().collect()
+    df2 = _request(tmp_path)._all().collect()
+    assert create_metaindex == [tmp_path]
+    assert df1.frame_equal(metaindex)
+    assert df2.frame_equal(metaindex)
+
+
+def test_metaindex_memory_cache_per_cache_dir(tmp_path, create_metaindex):
+    cache_dir1, cache_dir2 = tmp_path / "c1", tmp_path / "c2"
+    _request(cache_dir1)._all()
+    _request(cache_dir2)._all()
+    assert create_metaindex == [cache_dir1, cache_dir2]
+    assert _metaindex_file(cache_dir1).exists()
+    assert _metaindex_file(cache_dir2).exists()
+
+
+def test_metaindex_memory_cache_concurrent(tmp_path, monkeypatch, metaindex):
+    calls = []
+
+    def _create_metaindex(self):
+        calls.append(1)
+        time.sleep(0.1)
+        return metaindex
+
+    monkeypatch.setattr(DwdRoadRequest, "_create_metaindex", _create_metaindex)
+    request = _request(tmp_path)
+    with ThreadPoolExecutor(max_workers=8) as p:
+        dfs = list(p.map(lambda _: request._all().collect(), range(8)))
+    assert len(calls) == 1
+    assert all(df.frame_equal(metaindex) for df in dfs)
+
+
+def test_metaindex_memory_cache_lock_per_cache_dir(tmp_path, monkeypatch, metaindex):
+    cache_dir_cached, cache_dir_loading = tmp_path / "cached", tmp_path / "loading"
+    loading, release = threading.Event(), threading.Event()
+
+    def _create_metaindex(self):
+        if str(self.settings.cache_dir) == str(cache_dir_loading):
+            loading.set()
+            assert release.wait(timeout=5)
+        return metaindex
+
+    monkeypatch.setattr(DwdRoadRequest, "_create_metaindex", _create_metaindex)
+    _request(cache_dir_cached)._all()
+    with ThreadPoolExecutor(max_workers=1) as p:
+        future = p.submit(lambda: _request(cache_dir_loading)._all().collect())
+        try:
+            assert loading.wait(timeout=5)
+            # the cached lookup for the other cache dir doesn't wait for the pending load
+            with ThreadPoolExecutor(max_workers=1) as p_cached:
+                df = p_cached.submit(lambda: _request(cache_dir_cached)._all().collect()).result(timeout=1)
+            assert df.frame_equal(metaindex)
+        finally:
+            release.set()
+        assert future.result().frame_equal(metaindex)
+
+
+def test_metaindex_parquet_cache(tmp_path, create_metaindex, metaindex):
+    _request(tmp_path)._all()
+    DwdRoadRequest._metaindex_cache.clear()
+    df = _request(tmp_path)._all().collect()
+    assert create_metaindex == [tmp_path]
+    assert df.frame_equal(metaindex)
+    # the parquet file is written to a temporary file first which is then moved in place
+    assert os.listdir(tmp_path / "dwd_road") == [_metaindex_file(tmp_path).name]
+
+
+def test_metaindex_memory_cache_expires_with_parquet(tmp_path, create_metaindex, metaindex):
+    _request(tmp_path)._all()
+    DwdRoadRequest._metaindex_cache.clear()
+    mtime = _backdate(_metaindex_file(tmp_path), CacheExpiry.METAINDEX.value - 60 * 60)
+    _request(tmp_path)._all()
+    assert create_metaindex == [tmp_path]
+    # the in memory copy is as old as the parquet file, not as old as its loading
+    assert DwdRoadRequest._metaindex_cache[str(tmp_path)][0] == pytest.approx(mtime)
+    # an expired in memory copy is replaced with the still valid parquet file
+    DwdRoadRequest._metaindex_cache[str(tmp_path)] = (mtime - 2 * 60 * 60, pl.DataFrame())
+    df = _request(tmp_path)._all().collect()
+    assert create_metaindex == [tmp_path]
+    assert df.frame_equal(metaindex)
+
+
+def test_metaindex_parquet_write_error(tmp_path, monkeypatch, create_metaindex):
+    def write_parquet(self, file):
+        with open(file, "wb") as f:
+            f.write(b"PAR1")
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(pl.DataFrame, "write_parquet", write_parquet)
+    with pytest.raises(OSError):
+        _request(tmp_path)._all()
+    # the partially written temporary file is removed
+    assert os.listdir(tmp_path / "dwd_road") == []
+
+
+def test_metaindex_parquet_cache_expired(tmp_path, create_metaindex):
+    _request(tmp_path)._all()
+    DwdRoadRequest._metaindex_cache.clear()
+    _backdate(_metaindex_file(tmp_path), CacheExpiry.METAINDEX.value + 60)
+    _request(tmp_path)._all()
+    assert create_metaindex == [tmp_path, tmp_path]
+    assert time.time() - _metaindex_file(tmp_path).stat().st_mtime < 60
+
+
+def test_metaindex_parquet_cache_schema_mismatch(tmp_path, create_metaindex, metaindex):
+    metaindex_file = _metaindex_file(tmp_path)
+    metaindex_file.parent.mkdir(parents=True)
+    pl.DataFrame({"station_id": ["A006"]}).write_parquet(metaindex_file)
+    df = _request(tmp_path)._all().collect()
+    assert create_metaindex == [tmp_path]
+    assert df.frame_equal(metaindex)
+    assert pl.read_parquet(metaindex_file).frame_equal(metaindex)
+
+
+def test_metaindex_cache_disable(tmp_path, create_metaindex):
+    _request(tmp_path, cache_disable=True)._all()
+    _request(tmp_path, cache_disable=True)._all()
+    assert create_metaindex == [tmp_path, tmp_path]
+    assert not DwdRoadRequest._metaindex_cache
+    assert not (tmp_path / "dwd_road").exists()
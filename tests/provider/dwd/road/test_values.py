@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2018-2023, earthobservations developers.
+# Distributed under the MIT License. See LICENSE for more info.
+import datetime as dt
+import sys
+from io import BytesIO
+from types import ModuleType, SimpleNamespace
+
+import pandas as pd
+import polars as pl
+import pytest
+
+from wetterdienst import Settings
+from wetterdienst.provider.dwd.road import api
+from wetterdienst.provider.dwd.road.api import DwdRoadStationGroup, DwdRoadValues
+
+REMOTE_FILES = [
+    f"https://opendata.dwd.de/weather/weather_reports/road_weather_stations/KK/file_{i}.bin" for i in range(5)
+]
+
+# more than the ten parameters pdbufr reads at once, so the second batch is read and merged as well
+PARAMETERS = [
+    "airTemperature",
+    "roadSurfaceTemperature",
+    "totalPrecipitationOrTotalWaterEquivalent",
+    "intensityOfPrecipitation",
+    "windSpeed",
+    "windDirection",
+    "maximumWindGustSpeed",
+    "maximumWindGustDirection",
+    "relativeHumidity",
+    "horizontalVisibility",
+    "dewpointTemperature",
+]
+
+
+@pytest.fixture
+def values(monkeypatch, tmp_path):
+    """DwdRoadValues with a fixed file index, downloads replaced by returning the file name as content"""
+    downloaded = []
+
+    def download_files(urls, settings, ttl):
+        downloaded.extend(urls)
+        return [BytesIO(url.encode()) for url in urls]
+
+    monkeypatch.setattr(api, "download_files", download_files)
+    monkeypatch.setattr(DwdRoadValues, "_download_batch_size", 2)
+    monkeypatch.setattr(
+        DwdRoadValues,
+        "_create_file_index_for_dwd_road_weather_station",
+        lambda self, group: pl.DataFrame({"filename": REMOTE_FILES}),
+    )
+    values = object.__new__(DwdRoadValues)
+    values.sr = SimpleNamespace(start_date=None, settings=Settings(cache_dir=tmp_path))
+    values.downloaded = downloaded
+    return values
+
+
+def test_collect_data_by_station_group_keeps_file_order(monkeypatch, values):
+    monkeypatch.setattr(
+        DwdRoadValues,
+        "_DwdRoadValues__parse_dwd_road_weather_data",
+        staticmethod(
+            lambda filename_and_file, station_id, parameters: pl.DataFrame(
+                {"file": [filename_and_file[1].read().decode()]}
+            )
+        ),
+    )
+    df = values._collect_data_by_station_group(DwdRoadStationGroup.KK, "A006", ["airTemperature"])
+    assert df.get_column("file").to_list() == REMOTE_FILES
+
+
+def test_collect_data_by_station_group_stops_on_parse_error(monkeypatch, values):
+    def parse(filename_and_file, station_id, parameters):
+        raise RuntimeError("broken file")
+
+    monkeypatch.setattr(DwdRoadValues, "_DwdRoadValues__parse_dwd_road_weather_data", staticmethod(parse))
+    with pytest.raises(RuntimeError):
+        values._collect_data_by_station_group(DwdRoadStationGroup.KK, "A006", ["airTemperature"])
+    # parsing the first batch fails, by then the single worker may have started the second batch, the futures of
+    # all later batches are cancelled before they start
+    assert len(values.downloaded) <= 2 * DwdRoadValues._download_batch_size
+
+
+@pytest.fixture
+def read_bufr(monkeypatch):
+    """fake pdbufr module, read_bufr honors filters on a fixed table of two stations and records its calls"""
+    calls = []
+    data = pd.DataFrame(
+        {
+            "year": [2023, 2023, 2023],
+            "month": [9, 9, 9],
+            "day": [20, 20, 20],
+            "hour": [12, 12, 13],
+            "minute": [0, 0, 0],
+            "shortStationName": ["A006", "A007", "A006"],
+            **{parameter: [285.15, 290.15, 286.15] for parameter in PARAMETERS[:-1]},
+            "dewpointTemperature": [280.15, 281.15, 281.15],
+        }
+    )
+
+    def read_bufr(path, columns, filters=None):
+        calls.append({"columns": columns, "filters": filters})
+        df = data
+        for key, value in (filters or {}).items():
+            df = df[df[key] == value]
+        if df.empty:
+            return pd.DataFrame()
+        return df.loc[:, list(columns)].reset_index(drop=True)
+
+    pdbufr = ModuleType("pdbufr")
+    pdbufr.read_bufr = read_bufr
+    monkeypatch.setitem(sys.modules, "pdbufr", pdbufr)
+    return calls
+
+
+def test_parse_dwd_road_weather_data_filters_station(read_bufr):
+    df = DwdRoadValues._DwdRoadValues__parse_dwd_road_weather_data((REMOTE_FILES[0], BytesIO(b"")), "A006", PARAMETERS)
+    assert [call["filters"] for call in read_bufr] == [{"shortStationName": "A006"}] * 2
+    assert df.get_column("shortstationname").unique().to_list() == ["A006"]
+    df = df.filter(pl.col("parameter").eq("dewpointtemperature"))
+    assert df.get_column("timestamp").to_list() == [
+        dt.datetime(2023, 9, 20, 12, tzinfo=dt.timezone.utc),
+        dt.datetime(2023, 9, 20, 13, tzinfo=dt.timezone.utc),
+    ]
+    assert df.get_column("value").to_list() == [280.15, 281.15]
+
+
+def test_parse_dwd_road_weather_data_unknown_station(read_bufr):
+    df = DwdRoadValues._DwdRoadValues__parse_dwd_road_weather_data((REMOTE_FILES[0], BytesIO(b"")), "A999", PARAMETERS)
+    assert df.is_empty()
+    assert df.columns == ["shortstationname", "timestamp", "parameter", "value", "quality"]
+    # the second batch isn't read when the station has no messages in the file
+    assert len(read_bufr) == 1
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2018-2023, earthobservations developers.
+# Distributed under the MIT License. See LICENSE for more info.
+import datetime as dt
+import json
+from io import BytesIO
+from types import SimpleNamespace
+
+import polars as pl
+import pytest
+
+from wetterdienst import Settings
+from wetterdienst.provider.nws.observation import api
+from wetterdienst.provider.nws.observation.api import (
+    NwsObservationParameter,
+    NwsObservationValues,
+)
+
+
+@pytest.fixture
+def payload():
+    return {
+        "features": [
+            {
+                "properties": {
+                    "station": "https://api.weather.gov/stations/KBHB",
+                    "timestamp": "2023-09-20T12:53:00+00:00",
+                    "temperature": {"unitCode": "wmoUnit:degC", "value": 12.2},
+                    "windDirection": {"unitCode": "wmoUnit:degree_(angle)", "value": 250},
+                    "windGust": {"unitCode": "wmoUnit:km_h-1", "value": 7.2},
+                    "barometricPressure": {"unitCode": "wmoUnit:Pa", "value": 101320.5},
+                    "precipitationLastHour": {"unitCode": "wmoUnit:mm", "value": 0.5},
+                    "relativeHumidity": {"unitCode": "wmoUnit:percent", "value": None},
+                    "cloudLayers": [{"base": {"unitCode": "wmoUnit:m", "value": 1520}, "amount": "FEW"}],
+                }
+            },
+            {
+                "properties": {
+                    "temperature": {"unitCode": "wmoUnit:degC", "value": 11.1},
+                }
+            },
+        ]
+    }
+
+
+@pytest.fixture
+def values(monkeypatch, payload):
+    monkeypatch.setattr(api, "download_file", lambda url, settings, ttl: BytesIO(json.dumps(payload).encode()))
+    values = object.__new__(NwsObservationValues)
+    values.sr = SimpleNamespace(stations=SimpleNamespace(settings=Settings.default()))
+    return values
+
+
+def test_nws_collect_station_parameter(values):
+    df = values._collect_station_parameter("KBHB", NwsObservationParameter.HOURLY, NwsObservationParameter.HOURLY)
+    assert df.columns == ["station_id", "date", "parameter", "value", "quality"]
+    assert set(df.get_column("parameter")) == {parameter.value for parameter in NwsObservationParameter.HOURLY.HOURLY}
+    first = df.filter(pl.col("station_id").is_not_null())
+    first = dict(first.select("parameter", "value").iter_rows())
+    assert first["temperature"] == 12.2
+    assert first["winddirection"] == 250.0
+    assert first["relativehumidity"] is None
+    assert first["dewpoint"] is None
+    assert first["windgust"] == 7.2
+    assert first["barometricpressure"] == 101320.5
+    assert first["precipitationlasthour"] == 0.5
+    assert first.keys().isdisjoint({"cloudlayers"})
+    assert df.get_column("date").drop_nulls().unique().to_list() == [
+        dt.datetime(2023, 9, 20, 12, 53, tzinfo=dt.timezone.utc)
+    ]
+
+
+def test_nws_collect_station_parameter_missing_station_and_timestamp(values):
+    df = values._collect_station_parameter("KBHB", NwsObservationParameter.HOURLY, NwsObservationParameter.HOURLY)
+    second = df.filter(pl.col("station_id").is_null())
+    assert second.get_column("date").is_null().all()
+    assert dict(second.select("parameter", "value").iter_rows())["temperature"] == 11.1
@@ -1,12 +1,43 @@
 # -*- coding: utf-8 -*-
 # Copyright (C) 2018-2021, earthobservations developers.
 # Distributed under the MIT License. See LICENSE for more info.
+import asyncio
+
+import aiohttp
+
 from wetterdienst.settings import Settings
 from wetterdienst.util.cache import CacheExpiry
-from wetterdienst.util.network import NetworkFilesystemManager
+from wetterdienst.util.network import (
+    CONNECTION_LIMIT,
+    DNS_CACHE_TTL,
+    KEEPALIVE_TIMEOUT,
+    NetworkFilesystemManager,
+    get_client,
+)
 
 
 def test_create_fsspec_filesystem():
     fs1 = NetworkFilesystemManager.get(settings=Settings.default(), ttl=CacheExpiry.METAINDEX)
     fs2 = NetworkFilesystemManager.get(settings=Settings.default(), ttl=CacheExpiry.METAINDEX)
     assert id(fs1) == id(fs2)
+
+
+def test_get_client_keepalive(monkeypatch):
+    connector_kwargs = []
+
+    def tcp_connector(**kwargs):
+        connector_kwargs.append(kwargs)
+        return tcp_connector_original(**kwargs)
+
+    tcp_connector_original = aiohttp.TCPConnector
+    monkeypatch.setattr(aiohttp, "TCPConnector", tcp_connector)
+
+    async def create_session():
+        session = await get_client()
+        await session.close()
+
+    asyncio.run(create_session())
+    assert connector_kwargs == [
+        {"limit": CONNECTION_LIMIT, "keepalive_timeout": KEEPALIVE_TIMEOUT, "ttl_dns_cache": DNS_CACHE_TTL}
+    ]
+    assert (CONNECTION_LIMIT, KEEPALIVE_TIMEOUT, DNS_CACHE_TTL) == (32, 60, 300)
@@ -726,23 +726,23 @@ class TimeseriesRequest(Core):
 
         coords = Coordinates(np.array(lat), np.array(lon))
 
-        df = self.all().df
+        df_all = self.all().df
 
         distances, indices_nearest_neighbours = derive_nearest_neighbours(
-            latitudes=df.get_column(Columns.LATITUDE.value),
-            longitudes=df.get_column(Columns.LONGITUDE.value),
+            latitudes=df_all.get_column(Columns.LATITUDE.value).to_numpy(),
+            longitudes=df_all.get_column(Columns.LONGITUDE.value).to_numpy(),
             coordinates=coords,
-            number_nearby=df.shape[0],
+            number_nearby=df_all.shape[0],
         )
-        distances = distances.flatten() * EARTH_RADIUS_KM
+        distances = distances.ravel() * EARTH_RADIUS_KM
 
-        df = df[indices_nearest_neighbours.flatten(), :]
+        df = df_all[indices_nearest_neighbours.ravel(), :]
         df = df.with_columns(pl.lit(distances).alias(Columns.DISTANCE.value))
 
         return StationsResult(
             stations=self,
             df=df,
-            df_all=self.all().df,
+            df_all=df_all,
             stations_filter=StationsFilter.BY_RANK,
             rank=rank,
         )
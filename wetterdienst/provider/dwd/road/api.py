@@ -3,12 +3,16 @@
 # Distributed under the MIT License. See LICENSE for more info.
 import datetime as dt
 import logging
+import os
+import threading
+import time
 from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from functools import partial, reduce
+from functools import reduce
 from io import BytesIO
+from pathlib import Path
 from tempfile import NamedTemporaryFile
-from typing import TYPE_CHECKING, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 from urllib.parse import urljoin
 
 import polars as pl
@@ -24,7 +28,11 @@ from wetterdienst.metadata.timezone import Timezone
 from wetterdienst.metadata.unit import OriginUnit, SIUnit, UnitEnum
 from wetterdienst.util.cache import CacheExpiry
 from wetterdienst.util.eccodes import check_pdbufr
-from wetterdienst.util.network import download_file, list_remote_files_fsspec
+from wetterdienst.util.network import (
+    download_file,
+    download_files,
+    list_remote_files_fsspec,
+)
 from wetterdienst.util.parameter import DatasetTreeCore
 
 if TYPE_CHECKING:
@@ -153,6 +161,8 @@ class DwdRoadValues(TimeseriesValues):
     """
 
     _data_tz = Timezone.UTC
+    # number of files that are downloaded concurrently before being handed over for parsing
+    _download_batch_size = 32
 
     def __init__(self, stations_result: "StationsResult") -> None:
         check_pdbufr()
@@ -171,11 +181,10 @@ class DwdRoadValues(TimeseriesValues):
         else:
             parameters = [parameter.value]
         try:
-            df = self._collect_data_by_station_group(station_group, parameters)
+            df = self._collect_data_by_station_group(station_group, station_id, parameters)
         except ValueError:
             return pl.DataFrame()
-        df = df.rename(mapping={"timestamp": Columns.DATE.value, "shortstationname": Columns.STATION_ID.value})
-        return df.filter(pl.col(Columns.STATION_ID.value).eq(station_id))
+        return df.rename(mapping={"timestamp": Columns.DATE.value, "shortstationname": Columns.STATION_ID.value})
 
     def _create_file_index_for_dwd_road_weather_station(
         self,
@@ -205,7 +214,7 @@ class DwdRoadValues(TimeseriesValues):
         )
 
     def _collect_data_by_station_group(
-        self, road_weather_station_group: DwdRoadStationGroup, parameters: List[str]
+        self, road_weather_station_group: DwdRoadStationGroup, station_id: str, parameters: List[str]
     ) -> pl.DataFrame:
         """
         Method to collect data for one specified parameter. Manages restoring,
@@ -214,6 +223,7 @@ class DwdRoadValues(TimeseriesValues):
 
         Args:
             road_weather_station_group: subset id for which parameter is collected
+            station_id: station id for which data is kept from the subset files
 
         Returns:
             pandas.DataFrame for given parameter of station
@@ -224,8 +234,24 @@ class DwdRoadValues(TimeseriesValues):
                 pl.col(Columns.DATE.value).is_between(self.sr.start_date, self.sr.end_date)
             )
         remote_files = remote_files.get_column(Columns.FILENAME.value).to_list()
-        filenames_and_files = self._download_road_weather_observations(remote_files, self.sr.settings)
-        return self._parse_dwd_road_weather_data(filenames_and_files, parameters)
+        batches = [
+            remote_files[i : i + self._download_batch_size]
+            for i in range(0, len(remote_files), self._download_batch_size)
+        ]
+        data = []
+        # one worker downloads the batches one after another while the batches that arrived are parsed here
+        with ThreadPoolExecutor(max_workers=1) as p:
+            futures = [p.submit(self._download_road_weather_observations, batch, self.sr.settings) for batch in batches]
+            try:
+                for future in futures:
+                    data.append(self._parse_dwd_road_weather_data(future.result(), station_id, parameters))
+            finally:
+                # skip downloads that haven't started yet if parsing failed
+                for future in futures:
+                    future.cancel()
+        if len(data) == 1:
+            return data[0]
+        return pl.concat(data)
 
     @staticmethod
     def _download_road_weather_observations(remote_files: List[str], settings) -> List[Tuple[str, BytesIO]]:
@@ -233,15 +259,11 @@ class DwdRoadValues(TimeseriesValues):
         :param remote_files:    List of requested files
         :return:                List of downloaded files
         """
-        with ThreadPoolExecutor() as p:
-            files_in_bytes = p.map(
-                partial(download_file, settings=settings, ttl=CacheExpiry.TWELVE_HOURS), remote_files
-            )
-
+        files_in_bytes = download_files(remote_files, settings=settings, ttl=CacheExpiry.TWELVE_HOURS)
         return list(zip(remote_files, files_in_bytes))
 
     def _parse_dwd_road_weather_data(
-        self, filenames_and_files: List[Tuple[str, BytesIO]], parameters: List[str]
+        self, filenames_and_files: List[Tuple[str, BytesIO]], station_id: str, parameters: List[str]
     ) -> pl.DataFrame:
         """
         This function is used to read the road weather station data from given bytes object.
@@ -250,26 +272,31 @@ class DwdRoadValues(TimeseriesValues):
         Args:
             filenames_and_files: list of tuples of a filename and its local stored file
             that should be read
+            station_id: station id for which data is kept
 
         Returns:
-            pandas.DataFrame with requested data, for different station ids the data is
-            still put into one DataFrame
+            DataFrame with requested data of the given station
         """
-        return pl.concat(
-            [
-                self.__parse_dwd_road_weather_data(filename_and_file, parameters)
-                for filename_and_file in filenames_and_files
-            ]
-        )
+        data = [
+            self.__parse_dwd_road_weather_data(filename_and_file, station_id, parameters)
+            for filename_and_file in filenames_and_files
+        ]
+        if len(data) == 1:
+            return data[0]
+        return pl.concat(data)
 
     @staticmethod
-    def __parse_dwd_road_weather_data(filename_and_file: Tuple[str, BytesIO], parameters: List[str]) -> pl.DataFrame:
+    def __parse_dwd_road_weather_data(
+        filename_and_file: Tuple[str, BytesIO], station_id: str, parameters: List[str]
+    ) -> pl.DataFrame:
         """
         A wrapping function that only handles data for one station id. The files passed to
         it are thus related to this id. This is important for storing the data locally as
         the DataFrame that is stored should obviously only handle one station at a time.
         Args:
             filename_and_file: the files belonging to one station
+            station_id: station id for which data is kept, messages of other stations
+            are filtered out by pdbufr while reading
             resolution: enumeration of time resolution used to correctly parse the
             date field
         Returns:
@@ -284,6 +311,8 @@ class DwdRoadValues(TimeseriesValues):
         tf.seek(0)
         first_batch = parameters[:10]
         second_batch = parameters[10:]
+        # let pdbufr skip messages of other stations instead of decoding and merging them
+        filters = {"shortStationName": station_id}
         df = pdbufr.read_bufr(
             tf.name,
             columns=TIME_COLUMNS
@@ -291,8 +320,9 @@ class DwdRoadValues(TimeseriesValues):
                 "shortStationName",
                 *first_batch,
             ),
+            filters=filters,
         )
-        if second_batch:
+        if second_batch and not df.empty:
             df2 = pdbufr.read_bufr(
                 tf.name,
                 columns=TIME_COLUMNS
@@ -300,23 +330,26 @@ class DwdRoadValues(TimeseriesValues):
                     "shortStationName",
                     *second_batch,
                 ),
+                filters=filters,
             )
             df = df.merge(df2, on=TIME_COLUMNS + ("shortStationName",))
+        if df.empty:
+            return pl.DataFrame(
+                schema={
+                    "shortstationname": pl.Utf8,
+                    "timestamp": pl.Datetime(time_zone=Timezone.UTC.value),
+                    Columns.PARAMETER.value: pl.Utf8,
+                    Columns.VALUE.value: pl.Float64,
+                    Columns.QUALITY.value: pl.Float64,
+                }
+            )
         df = pl.from_pandas(df)
         df = df.select(
             pl.col("shortStationName"),
-            pl.concat_str(
-                exprs=[
-                    pl.col("year").cast(pl.Utf8),
-                    pl.col("month").cast(pl.Utf8).str.rjust(2, "0"),
-                    pl.col("day").cast(pl.Utf8).str.rjust(2, "0"),
-                    pl.col("hour").cast(pl.Utf8).str.rjust(2, "0"),
-                    pl.col("minute").cast(pl.Utf8).str.rjust(2, "0"),
-                ]
-            )
-            .str.strptime(datatype=pl.Datetime(time_zone="UTC"), fmt="%Y%m%d%H%M")
+            pl.datetime(*(pl.col(col) for col in TIME_COLUMNS))
+            .dt.replace_time_zone(Timezone.UTC.value)
             .alias("timestamp"),
-            *parameters
+            *parameters,
         )
         df = df.rename({col: col.lower() for col in df.columns})
         df = df.melt(
@@ -373,6 +406,13 @@ class DwdRoadRequest(TimeseriesRequest):
         "GDS-Verzeichnis": Columns.STATION_GROUP.value,
         "außer Betrieb (gemeldet)": Columns.HAS_FILE.value,
     }
+    # parsed metaindex shared across instances as (creation time, DataFrame) per cache dir, see _all
+    _metaindex_cache: Dict[str, Tuple[float, pl.DataFrame]] = {}
+    # one lock per cache dir, so loading one metaindex doesn't block lookups for other cache dirs
+    _metaindex_locks: Dict[str, threading.Lock] = {}
+    _metaindex_lock = threading.Lock()
+    # part of the parquet file name, bump when the parsed metaindex changes
+    _metaindex_version = 1
     _dtypes = {
         Columns.STATION_ID.value: pl.Utf8,
         Columns.NAME.value: pl.Utf8,
@@ -406,8 +446,59 @@ class DwdRoadRequest(TimeseriesRequest):
         )
 
     def _all(self) -> pl.LazyFrame:
-        payload = download_file(self._endpoint, self.settings, CacheExpiry.METAINDEX)
-        df = pl.read_excel(source=payload, sheet_name="Tabelle1", read_csv_options={"infer_schema_length": 0})
+        """
+        Return the road weather station metaindex. The parsed xlsx is kept in memory on the class and
+        as parquet file in the cache dir for the duration of CacheExpiry.METAINDEX, counted from the
+        creation of the parquet file, so repeated requests don't have to parse it again.
+        """
+        if self.settings.cache_disable:
+            return self._create_metaindex().lazy()
+        key = str(self.settings.cache_dir)
+        with self._metaindex_lock:
+            lock = self._metaindex_locks.setdefault(key, threading.Lock())
+        with lock:
+            cached = self._metaindex_cache.get(key)
+            if cached is None or self._is_metaindex_expired(cached[0]):
+                cached = self._metaindex_cache[key] = self._load_metaindex()
+            return cached[1].lazy()
+
+    @staticmethod
+    def _is_metaindex_expired(created_at: float) -> bool:
+        return time.time() - created_at >= CacheExpiry.METAINDEX.value
+
+    def _load_metaindex(self) -> Tuple[float, pl.DataFrame]:
+        """
+        Read the metaindex from its parquet copy in the cache dir or create it if missing, expired or
+        not matching the expected schema. Returns the metaindex together with its creation time.
+        """
+        metaindex_file = Path(self.settings.cache_dir) / "dwd_road" / f"metaindex_v{self._metaindex_version}.parquet"
+        if metaindex_file.exists():
+            created_at = metaindex_file.stat().st_mtime
+            if not self._is_metaindex_expired(created_at):
+                df = pl.read_parquet(metaindex_file)
+                if df.schema == self._dtypes:
+                    return created_at, df
+        df = self._create_metaindex()
+        metaindex_file.parent.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file first, so that concurrent readers never see a partial file
+        metaindex_file_tmp = metaindex_file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            df.write_parquet(metaindex_file_tmp)
+            metaindex_file_tmp.replace(metaindex_file)
+        except Exception:
+            metaindex_file_tmp.unlink(missing_ok=True)
+            raise
+        return metaindex_file.stat().st_mtime, df
+
+    def _create_metaindex(self) -> pl.DataFrame:
+        # the parquet copy is the persistent cache, so the xlsx itself is fetched fresh and
+        # the age of the metaindex is bound by CacheExpiry.METAINDEX alone
+        payload = download_file(self._endpoint, self.settings, CacheExpiry.NO_CACHE)
+        df = pl.read_excel(
+            source=payload,
+            sheet_name="Tabelle1",
+            read_csv_options={"infer_schema_length": 0, "columns": list(self._column_mapping.keys())},
+        )
         df = df.rename(mapping=self._column_mapping)
         df = df.select(pl.col(col) for col in self._column_mapping.values())
         df = df.filter(
@@ -416,8 +507,7 @@ class DwdRoadRequest(TimeseriesRequest):
             & pl.col(Columns.STATION_ID.value).is_not_null()
         )
         df = df.with_columns(
-            pl.col(Columns.LONGITUDE.value).str.replace(",", "."),
-            pl.col(Columns.LATITUDE.value).str.replace(",", "."),
+            pl.col([Columns.LONGITUDE.value, Columns.LATITUDE.value]).str.replace(",", ".", literal=True),
             pl.when(~pl.col(Columns.ROAD_TYPE.value).str.contains("x")).then(pl.col(Columns.ROAD_TYPE.value)),
             pl.when(~pl.col(Columns.ROAD_SURROUNDINGS_TYPE.value).str.contains("x")).then(
                 pl.col(Columns.ROAD_SURROUNDINGS_TYPE.value)
@@ -426,5 +516,4 @@ class DwdRoadRequest(TimeseriesRequest):
                 pl.col(Columns.ROAD_SURFACE_TYPE.value)
             ),
         )
-        df = df.with_columns(pl.col(col).cast(dtype) for col, dtype in self._dtypes.items())
-        return df.lazy()
+        return df.with_columns(pl.col(col).cast(dtype) for col, dtype in self._dtypes.items())
@@ -98,6 +98,24 @@ class NwsObservationPeriod(Enum):
 class NwsObservationValues(TimeseriesValues):
     _data_tz = Timezone.UTC
     _endpoint = "https://api.weather.gov/stations/{station_id}/observations"
+    # observation properties as named in the response, lowercased they match the parameter values
+    _parameters = (
+        "temperature",
+        "dewpoint",
+        "windDirection",
+        "windSpeed",
+        "windGust",
+        "barometricPressure",
+        "seaLevelPressure",
+        "visibility",
+        "maxTemperatureLast24Hours",
+        "minTemperatureLast24Hours",
+        "precipitationLastHour",
+        "precipitationLast3Hours",
+        "precipitationLast6Hours",
+        "relativeHumidity",
+        "windChill",
+    )
 
     def _collect_station_parameter(self, station_id: str, parameter: Enum, dataset: Enum) -> pl.DataFrame:
         url = self._endpoint.format(station_id=station_id)
@@ -111,95 +129,34 @@ class NwsObservationValues(TimeseriesValues):
         except KeyError:
             return pl.DataFrame()
 
+        # flatten the nested {"value": ...} objects while building the rows, so no struct columns are created
         df = pl.from_dicts(
-            data,
+            [
+                {
+                    Columns.STATION_ID.value: properties.get("station"),
+                    Columns.DATE.value: properties.get("timestamp"),
+                    **{
+                        parameter.lower(): (properties.get(parameter) or {}).get("value")
+                        for parameter in self._parameters
+                    },
+                }
+                for properties in data
+            ],
             schema={
-                "station": pl.Utf8,
-                "timestamp": pl.Utf8,
-                "temperature": pl.Struct(
-                    [
-                        pl.Field("value", pl.Float64),
-                    ]
-                ),
-                "dewpoint": pl.Struct(
-                    [
-                        pl.Field("value", pl.Float64),
-                    ]
-                ),
-                "windDirection": pl.Struct(
-                    [
-                        pl.Field("value", pl.Int64),
-                    ]
-                ),
-                "windSpeed": pl.Struct(
-                    [
-                        pl.Field("value", pl.Float64),
-                    ]
-                ),
-                "windGust": pl.Struct(
-                    [
-                        pl.Field("value", pl.Int32),
-                    ]
-                ),
-                "barometricPressure": pl.Struct(
-                    [
-                        pl.Field("value", pl.Int64),
-                    ]
-                ),
-                "seaLevelPressure": pl.Struct(
-                    [
-                        pl.Field("value", pl.Int64),
-                    ]
-                ),
-                "visibility": pl.Struct(
-                    [
-                        pl.Field("value", pl.Int64),
-                    ]
-                ),
-                "maxTemperatureLast24Hours": pl.Struct([pl.Field("value", pl.Int32)]),
-                "minTemperatureLast24Hours": pl.Struct([pl.Field("value", pl.Int32)]),
-                "precipitationLastHour": pl.Struct(
-                    [
-                        pl.Field("value", pl.Int64),
-                    ]
-                ),
-                "precipitationLast3Hours": pl.Struct(
-                    [
-                        pl.Field("value", pl.Int64),
-                    ]
-                ),
-                "precipitationLast6Hours": pl.Struct(
-                    [
-                        pl.Field("value", pl.Int64),
-                    ]
-                ),
-                "relativeHumidity": pl.Struct(
-                    [
-                        pl.Field("value", pl.Float64),
-                    ]
-                ),
-                "windChill": pl.Struct(
-                    [
-                        pl.Field("value", pl.Float64),
-                    ]
-                ),
+                Columns.STATION_ID.value: pl.Utf8,
+                Columns.DATE.value: pl.Utf8,
+                **{parameter.lower(): pl.Float64 for parameter in self._parameters},
             },
         )
-
-        df = df.rename(mapping={col: col.lower() for col in df.columns})
-        df = df.rename(mapping={"station": Columns.STATION_ID.value, "timestamp": Columns.DATE.value})
-
+        df = df.with_columns(
+            pl.col(Columns.DATE.value).apply(dt.datetime.fromisoformat).cast(pl.Datetime(time_zone="UTC"))
+        )
         df = df.melt(
             id_vars=[Columns.STATION_ID.value, Columns.DATE.value],
             variable_name=Columns.PARAMETER.value,
             value_name=Columns.VALUE.value,
         )
-        df = df.filter(pl.col("parameter").ne("cloudlayers"))
-        return df.with_columns(
-            pl.col("date").apply(dt.datetime.fromisoformat).cast(pl.Datetime(time_zone="UTC")),
-            pl.col("value").apply(lambda value: value["value"]).cast(pl.Float64),
-            pl.lit(None, dtype=pl.Float64).alias(Columns.QUALITY.value),
-        )
+        return df.with_columns(pl.lit(None, dtype=pl.Float64).alias(Columns.QUALITY.value))
 
 
 class NwsObservationRequest(TimeseriesRequest):
@@ -5,6 +5,7 @@ import os
 from io import BytesIO
 from typing import Dict, List, Optional, Tuple, Union
 
+import aiohttp
 import stamina
 from fsspec import AbstractFileSystem
 from fsspec.implementations.cached import WholeFileCacheFileSystem
@@ -13,6 +14,27 @@ from fsspec.implementations.http import HTTPFileSystem
 from wetterdienst.settings import Settings
 from wetterdienst.util.cache import CacheExpiry
 
+# connection pool of the FSSPEC HTTP client session, see get_client
+CONNECTION_LIMIT = 32
+KEEPALIVE_TIMEOUT = 60
+DNS_CACHE_TTL = 300
+
+
+async def get_client(**kwargs) -> aiohttp.ClientSession:
+    """
+    Create the aiohttp client session for the FSSPEC HTTP filesystems. Its connector keeps
+    connections alive and caches DNS lookups, so consecutive downloads from one host reuse the
+    same TCP/TLS connection and don't resolve the hostname again.
+
+    :param kwargs:  Client kwargs as passed through ``Settings.fsspec_client_kwargs``.
+    :returns:       aiohttp client session
+    """
+    if "connector" not in kwargs:
+        kwargs["connector"] = aiohttp.TCPConnector(
+            limit=CONNECTION_LIMIT, keepalive_timeout=KEEPALIVE_TIMEOUT, ttl_dns_cache=DNS_CACHE_TTL
+        )
+    return aiohttp.ClientSession(**kwargs)
+
 
 class NetworkFilesystemManager:
     """
@@ -40,7 +62,9 @@ class NetworkFilesystemManager:
         real_cache_dir = os.path.join(settings.cache_dir, "fsspec", key)
 
         use_cache = not (settings.cache_disable or ttl is CacheExpiry.NO_CACHE)
-        fs = HTTPFileSystem(use_listings_cache=use_cache, client_kwargs=settings.fsspec_client_kwargs)
+        fs = HTTPFileSystem(
+            use_listings_cache=use_cache, client_kwargs=settings.fsspec_client_kwargs, get_client=get_client
+        )
 
         if settings.cache_disable or ttl is CacheExpiry.NO_CACHE:
             filesystem_effective = fs
@@ -75,6 +99,7 @@ def list_remote_files_fsspec(url: str, settings: Settings, ttl: CacheExpiry = Ca
         listings_cache_type="filedircache",
         listings_cache_location=settings.cache_dir,
         client_kwargs=settings.fsspec_client_kwargs,
+        get_client=get_client,
     )
 
     return fs.find(url)
@@ -95,3 +120,23 @@ def download_file(
     filesystem = NetworkFilesystemManager.get(settings=settings, ttl=ttl)
     payload = filesystem.cat(url)
     return BytesIO(payload)
+
+
+@stamina.retry(on=Exception, attempts=3)
+def download_files(
+    urls: List[str], settings: Settings, ttl: Optional[Union[int, CacheExpiry]] = CacheExpiry.NO_CACHE
+) -> List[BytesIO]:
+    """
+    A function used to download multiple files from the server at once. The downloads are
+    gathered concurrently on the event loop of the FSSPEC filesystem.
+
+    :param urls:    The urls to the files on the server
+    :param ttl:     How long the resources should be cached.
+
+    :returns:        Bytes of the files, in the same order as the urls.
+    """
+    if not urls:
+        return []
+    filesystem = NetworkFilesystemManager.get(settings=settings, ttl=ttl)
+    payloads = filesystem.cat(urls)
+    return [BytesIO(payloads[url]) for url in urls]